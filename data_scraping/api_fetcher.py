@@ -11,51 +11,135 @@ including support for various HTTP methods and pagination handling.
 @license MIT
 @dependencies
 - requests - Apache License 2.0
+- orjson - Apache License 2.0 / MIT License
+- urllib3 - MIT License
+- concurrent.futures - Python Software Foundation License
+- urllib - Python Software Foundation License
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs
+
+import orjson
 import requests
+from urllib3.util.retry import Retry
+
+from .session import build_session
 
 class APIFetcher:
-    def __init__(self, base_url, headers=None):
+    SUPPORTED_METHODS = frozenset(['GET', 'POST', 'PUT', 'DELETE', 'HEAD'])
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, base_url, headers=None, pool_connections=10, pool_maxsize=50, retries=3, backoff_factor=0.3,
+                 cache_name='apifetcher_cache', cache_ttl=None):
         self.base_url = base_url
         self.headers = headers or {}
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.cache_name = cache_name
+        self.cache_ttl = cache_ttl
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.session = self._build_session(self._build_retry(retries))
+        self._retry_sessions = {}
+
+    def _build_session(self, retry):
+        return build_session(self.pool_connections, self.pool_maxsize, retry=retry,
+                             cache_name=self.cache_name, cache_ttl=self.cache_ttl)
+
+    def _build_retry(self, retries, allowed_methods=Retry.DEFAULT_ALLOWED_METHODS):
+        return Retry(
+            total=retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=allowed_methods,
+            raise_on_status=False
+        )
+
+    def close(self):
+        self.session.close()
+        for session in self._retry_sessions.values():
+            session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def fetch_data(self, endpoint, params=None, method='GET', data=None, json=None):
         url = f"{self.base_url}/{endpoint}"
         response = self._make_request(url, params=params, method=method, data=data, json=json)
-        return response.json()
+        return self._decode(response)
 
     def fetch_paginated_data(self, endpoint, params=None, method='GET', data=None, json=None, next_page_param='page', start_page=1):
-        all_data = []
+        return list(self.iter_paginated_data(endpoint, params=params, method=method, data=data, json=json,
+                                             next_page_param=next_page_param, start_page=start_page))
+
+    def iter_paginated_data(self, endpoint, params=None, method='GET', data=None, json=None, next_page_param='page', start_page=1):
+        # Yields items page by page, so only the current page is held in memory.
         page = start_page
 
         while True:
             params = params or {}
             params[next_page_param] = page
             response = self._make_request(f"{self.base_url}/{endpoint}", params=params, method=method, data=data, json=json)
-            json_data = response.json()
-            all_data.extend(json_data)
+            yield from self._decode(response)
 
             if 'next' not in response.links:
                 break
 
             page += 1
 
+    def fetch_paginated_data_concurrent(self, endpoint, params=None, method='GET', data=None, json=None,
+                                        next_page_param='page', start_page=1, max_workers=10):
+        url = f"{self.base_url}/{endpoint}"
+        first_params = dict(params or {}, **{next_page_param: start_page})
+        response = self._make_request(url, params=first_params, method=method, data=data, json=json)
+        all_data = list(self._decode(response))
+
+        last_page = self._last_page(response, next_page_param)
+        if last_page is None:
+            # Without a Link: last header the page count is unknown, so walk the rest serially.
+            if 'next' in response.links:
+                all_data.extend(self.fetch_paginated_data(endpoint, params=dict(params or {}), method=method,
+                                                          data=data, json=json, next_page_param=next_page_param,
+                                                          start_page=start_page + 1))
+            return all_data
+
+        def fetch_page(page):
+            page_params = dict(params or {}, **{next_page_param: page})
+            return self._decode(self._make_request(url, params=page_params, method=method, data=data, json=json))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for json_data in executor.map(fetch_page, range(start_page + 1, last_page + 1)):
+                all_data.extend(json_data)
+
         return all_data
 
-    def _make_request(self, url, params=None, method='GET', data=None, json=None):
+    def _decode(self, response):
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos)
+
+    def _last_page(self, response, next_page_param):
+        last = response.links.get('last')
+        if not last:
+            return None
+        values = parse_qs(urlparse(last['url']).query).get(next_page_param)
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=self.headers, params=params)
-            elif method == 'POST':
-                response = requests.post(url, headers=self.headers, params=params, data=data, json=json)
-            elif method == 'PUT':
-                response = requests.put(url, headers=self.headers, params=params, data=data, json=json)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=self.headers, params=params)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+            return int(values[0])
+        except (TypeError, ValueError):
+            return None
 
+    def _make_request(self, url, params=None, method='GET', data=None, json=None, session=None):
+        if method not in self.SUPPORTED_METHODS:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+
+        try:
+            session = session if session is not None else self.session
+            response = session.request(method, url, headers=self.headers, params=params, data=data, json=json)
             response.raise_for_status()
             return response
         except requests.RequestException as e:
@@ -72,13 +156,21 @@ class APIFetcher:
         response = self._make_request(url, params=params, method='GET')
         return response.status_code
 
-    def fetch_data_with_retry(self, endpoint, params=None, method='GET', data=None, json=None, retries=3):
-        attempt = 0
-        while attempt < retries:
-            try:
-                return self.fetch_data(endpoint, params=params, method=method, data=data, json=json)
-            except requests.RequestException as e:
-                print(f"Attempt {attempt + 1} failed: {e}")
-                attempt += 1
-                if attempt == retries:
-                    raise
+    def fetch_data_with_retry(self, endpoint, params=None, method='GET', data=None, json=None, retries=None):
+        retries = self.retries if retries is None else retries
+        if retries == self.retries and method in Retry.DEFAULT_ALLOWED_METHODS:
+            return self.fetch_data(endpoint, params=params, method=method, data=data, json=json)
+
+        url = f"{self.base_url}/{endpoint}"
+        response = self._make_request(url, params=params, method=method, data=data, json=json,
+                                      session=self._retry_session(retries))
+        return self._decode(response)
+
+    def _retry_session(self, retries):
+        # Callers of fetch_data_with_retry opt in to replaying every method, POST included.
+        # One session is built per retry count and then reused.
+        session = self._retry_sessions.get(retries)
+        if session is None:
+            session = self._build_session(self._build_retry(retries, allowed_methods=self.SUPPORTED_METHODS))
+            self._retry_sessions[retries] = session
+        return session
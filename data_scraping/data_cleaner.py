@@ -11,82 +11,198 @@ and cleaning pandas DataFrames.
 @date 2024-07-01
 @license MIT
 @dependencies
+- os - Python Software Foundation License
 - re - Python Software Foundation License
+- concurrent.futures - Python Software Foundation License
+- functools - Python Software Foundation License
+- numbers - Python Software Foundation License
+- warnings - Python Software Foundation License
+- numpy - BSD 3-Clause License
 - pandas - BSD 3-Clause License
 - nltk - Apache License 2.0
 """
 
+import os
 import re
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from numbers import Integral
+
+import numpy as np
 import pandas as pd
 from nltk.corpus import stopwords
-from nltk.stem import PorterStemmer, WordNetLemmatizer
-from nltk.tokenize import word_tokenize
+from nltk.stem import PorterStemmer, SnowballStemmer, WordNetLemmatizer
+
+# Default NLTK resources, shared by every DataCleaner so they are built once per process.
+_STEMMER = PorterStemmer()
+_LEMMATIZER = WordNetLemmatizer()
+_MEMO_SIZE = 200_000
+_memoized_methods = {}
+
+def _config_key(obj):
+    # Stock NLTK stemmers behave identically for identical configuration, so copies
+    # (including the ones pickled into worker processes) can share one memo table.
+    kind = type(obj)
+    if kind is PorterStemmer:
+        return (kind, obj.mode)
+    if kind is SnowballStemmer:
+        return (kind, type(obj.stemmer), bool(obj.stemmer.stopwords))
+    if kind is WordNetLemmatizer:
+        return (kind,)
+    return None
+
+def _memoized_method(obj, name):
+    key = _config_key(obj)
+    if key is None:
+        return getattr(obj, name)
+    key += (name,)
+    method = _memoized_methods.get(key)
+    if method is None:
+        method = _memoized_methods.setdefault(key, lru_cache(maxsize=_MEMO_SIZE)(getattr(obj, name)))
+    return method
+
+@lru_cache(maxsize=None)
+def _english_stop_words():
+    return frozenset(stopwords.words('english'))
 
 class DataCleaner:
-    def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
-        self.stemmer = PorterStemmer()
-        self.lemmatizer = WordNetLemmatizer()
+    _HTML_RE = re.compile(r'<[^>]*>')
+    _SPECIAL_RE = re.compile(r'[^a-zA-Z\s]')
+    _SPECIAL_DIGITS_RE = re.compile(r'[^a-zA-Z\s\d]')
+    _CLEAN_RE = re.compile(r'<[^>]*>|[^a-zA-Z\s]')
+    # Keeps URLs, e-mail addresses, abbreviations, numbers and hyphenated words whole,
+    # as word_tokenize does; anything else splits into words and single punctuation marks.
+    _TOKEN_RE = re.compile(r'''
+        (?:https?://|www\.)[^\s]+?(?=[.,;:!?)\]]*(?:\s|$))
+      | [\w.+-]+@\w[\w-]*(?:\.[\w-]+)+
+      | (?:[A-Za-z]\.){2,}
+      | \d+(?:[.,]\d+)+
+      | \w+(?:-\w+)+
+      | \w+
+      | [^\w\s]
+    ''', re.VERBOSE)
+
+    def __init__(self, n_jobs=1):
+        if isinstance(n_jobs, bool) or not isinstance(n_jobs, Integral) or (n_jobs < 1 and n_jobs != -1):
+            raise ValueError(f"n_jobs must be -1 or a positive integer, got {n_jobs!r}")
+        self.n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else int(n_jobs)
+        self.stop_words = set(_english_stop_words())
+        self.stemmer = _STEMMER
+        self.lemmatizer = _LEMMATIZER
 
     def remove_html_tags(self, text):
-        clean = re.compile('<.*?>')
-        return re.sub(clean, '', text)
+        return self._HTML_RE.sub('', text)
 
     def remove_special_characters(self, text, remove_digits=False):
-        pattern = r'[^a-zA-Z\s]' if not remove_digits else r'[^a-zA-Z\s\d]'
-        text = re.sub(pattern, '', text)
-        return text
+        pattern = self._SPECIAL_RE if not remove_digits else self._SPECIAL_DIGITS_RE
+        return pattern.sub('', text)
 
     def to_lowercase(self, text):
         return text.lower()
 
     def remove_stopwords(self, text):
-        tokens = word_tokenize(text)
-        filtered_tokens = [word for word in tokens if word.lower() not in self.stop_words]
-        return ' '.join(filtered_tokens)
+        return ' '.join(self._filter_stopwords(self._tokenize(text)))
 
     def stem_text(self, text):
-        tokens = word_tokenize(text)
-        stemmed_tokens = [self.stemmer.stem(word) for word in tokens]
-        return ' '.join(stemmed_tokens)
+        return ' '.join(self._stem_tokens(self._tokenize(text)))
 
     def lemmatize_text(self, text):
-        tokens = word_tokenize(text)
-        lemmatized_tokens = [self.lemmatizer.lemmatize(word) for word in tokens]
-        return ' '.join(lemmatized_tokens)
+        return ' '.join(self._lemmatize_tokens(self._tokenize(text)))
+
+    def _tokenize(self, text):
+        return self._TOKEN_RE.findall(text)
+
+    # The token stages return generators so a chained pipeline builds no intermediate lists.
+    def _filter_stopwords(self, tokens, lowercased=False):
+        stop_words = self.stop_words
+        if lowercased:
+            return (word for word in tokens if word not in stop_words)
+        return (word for word in tokens if word.lower() not in stop_words)
+
+    def _stem_tokens(self, tokens):
+        return map(_memoized_method(self.stemmer, 'stem'), tokens)
+
+    def _lemmatize_tokens(self, tokens):
+        return map(_memoized_method(self.lemmatizer, 'lemmatize'), tokens)
 
     def normalize_text(self, text, remove_html=True, remove_special_chars=True, to_lower=True,
                        remove_stopwords=True, use_stemming=False, use_lemmatization=False):
-        if remove_html:
+        if remove_html and remove_special_chars:
+            text = self._CLEAN_RE.sub('', text)
+        elif remove_html:
             text = self.remove_html_tags(text)
-        if remove_special_chars:
+        elif remove_special_chars:
             text = self.remove_special_characters(text)
         if to_lower:
             text = self.to_lowercase(text)
+        if not (remove_stopwords or use_stemming or use_lemmatization):
+            return text
+        return self._process_tokens(text, remove_stopwords=remove_stopwords, use_stemming=use_stemming,
+                                    use_lemmatization=use_lemmatization, lowercased=to_lower)
+
+    def _process_tokens(self, text, remove_stopwords=True, use_stemming=False, use_lemmatization=False,
+                        lowercased=False):
+        # Tokenize once and chain every token stage lazily into a single join.
+        tokens = self._tokenize(text)
         if remove_stopwords:
-            text = self.remove_stopwords(text)
+            tokens = self._filter_stopwords(tokens, lowercased=lowercased)
         if use_stemming:
-            text = self.stem_text(text)
+            tokens = self._stem_tokens(tokens)
         if use_lemmatization:
-            text = self.lemmatize_text(text)
-        return text
+            tokens = self._lemmatize_tokens(tokens)
+        return ' '.join(tokens)
 
     def clean_dataframe(self, df):
-        return df.dropna().reset_index(drop=True)
+        return self.downcast(df.dropna().reset_index(drop=True))
+
+    def downcast(self, df):
+        # Scraped numerics rarely need 64 bits; narrower dtypes halve the memory later scans touch.
+        df = df.copy(deep=False)
+        for column in df.select_dtypes('float').columns:
+            df[column] = pd.to_numeric(df[column], downcast='float')
+        for column in df.select_dtypes('integer').columns:
+            df[column] = pd.to_numeric(df[column], downcast='integer')
+        return df
 
     def clean_column(self, df, column_name, remove_html=True, remove_special_chars=True, to_lower=True,
                      remove_stopwords=True, use_stemming=False, use_lemmatization=False):
-        df[column_name] = df[column_name].apply(lambda text: self.normalize_text(
-            text,
-            remove_html=remove_html,
-            remove_special_chars=remove_special_chars,
-            to_lower=to_lower,
-            remove_stopwords=remove_stopwords,
-            use_stemming=use_stemming,
-            use_lemmatization=use_lemmatization
-        ))
+        # The regex stages run over the whole column through the vectorized .str accessor.
+        # The column always comes back as the pandas 'string' dtype, with <NA> for missing values.
+        texts = df[column_name].astype('string')
+        if remove_html and remove_special_chars:
+            texts = texts.str.replace(self._CLEAN_RE, '', regex=True)
+        elif remove_html:
+            texts = texts.str.replace(self._HTML_RE, '', regex=True)
+        elif remove_special_chars:
+            texts = texts.str.replace(self._SPECIAL_RE, '', regex=True)
+        if to_lower:
+            texts = texts.str.lower()
+
+        # Scraped data is full of duplicate rows, so each distinct text goes through NLTK once.
+        if remove_stopwords or use_stemming or use_lemmatization:
+            process = partial(
+                self._process_tokens,
+                remove_stopwords=remove_stopwords,
+                use_stemming=use_stemming,
+                use_lemmatization=use_lemmatization,
+                lowercased=to_lower
+            )
+            if self.n_jobs > 1:
+                texts = self._map_parallel(texts, process)
+            else:
+                texts = texts.map(lru_cache(maxsize=100_000)(process), na_action='ignore')
+
+        df[column_name] = texts.astype('string')
         return df
 
+    def _map_parallel(self, texts, func):
+        uniques = texts.dropna().unique()
+        chunksize = max(1, len(uniques) // (self.n_jobs * 4))
+        with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+            results = dict(zip(uniques, executor.map(func, uniques, chunksize=chunksize)))
+        return texts.map(results, na_action='ignore')
+
     def drop_duplicate_rows(self, df):
         return df.drop_duplicates().reset_index(drop=True)
 
@@ -95,16 +211,37 @@ class DataCleaner:
 
     def fill_missing_values(self, df, strategy='mean'):
         if strategy == 'mean':
-            return df.fillna(df.mean())
+            fill_values = df.mean(numeric_only=True)
         elif strategy == 'median':
-            return df.fillna(df.median())
+            fill_values = df.median(numeric_only=True)
         elif strategy == 'mode':
-            return df.fillna(df.mode().iloc[0])
+            fill_values = df.mode().iloc[0]
         else:
             raise ValueError(f"Unsupported fill strategy: {strategy}")
+        return df.fillna(fill_values)
 
     def encode_categorical_columns(self, df):
         return pd.get_dummies(df)
 
     def normalize_dataframe(self, df):
-        return (df - df.min()) / (df.max() - df.min())
+        # Each column gets the same result and dtype as (col - col.min()) / (col.max() - col.min()).
+        # Plain NumPy columns are rescaled in place on a single copy; nullable extension columns
+        # such as Int64 keep the pandas arithmetic so their <NA> values survive.
+        result = df.copy(deep=False)
+        for position in range(df.shape[1]):
+            column = df.iloc[:, position]
+            if not (isinstance(column.dtype, np.dtype) and column.dtype.kind in 'iuf'):
+                result.isetitem(position, (column - column.min()) / (column.max() - column.min()))
+                continue
+
+            dtype = column.dtype if column.dtype.kind == 'f' else np.float64
+            values = column.to_numpy(dtype=dtype, copy=True)
+            if values.size:
+                # Constant and all-NaN columns come out as NaN, as with the pandas arithmetic.
+                with warnings.catch_warnings(), np.errstate(divide='ignore', invalid='ignore'):
+                    warnings.simplefilter('ignore', RuntimeWarning)
+                    minimum = np.nanmin(values)
+                    values -= minimum
+                    values /= np.nanmax(values)
+            result.isetitem(position, values)
+        return result
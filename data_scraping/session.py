@@ -0,0 +1,30 @@
+"""
+@package data_scraping.session
+@brief Provides HTTP session construction shared by the fetchers.
+
+This module contains the helper that builds the pooled requests sessions
+used by APIFetcher and WebScraper, with optional retries and optional
+on-disk response caching.
+
+@date 2024-07-01
+@license MIT
+@dependencies
+- requests - Apache License 2.0
+- requests-cache - BSD 2-Clause License (only when caching is enabled)
+"""
+
+import requests
+from requests.adapters import DEFAULT_RETRIES, HTTPAdapter
+
+def build_session(pool_connections=10, pool_maxsize=50, retry=None, cache_name=None, cache_ttl=None):
+    if cache_ttl is not None:
+        from requests_cache import CachedSession
+        session = CachedSession(cache_name, backend='sqlite', expire_after=cache_ttl,
+                                allowable_methods=('GET', 'HEAD'))
+    else:
+        session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                          max_retries=retry if retry is not None else DEFAULT_RETRIES)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
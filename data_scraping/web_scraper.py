@@ -11,9 +11,14 @@ fetching web pages and parsing HTML content.
 @license MIT
 @dependencies
 - BeautifulSoup (bs4) - MIT License
+- lxml - BSD 3-Clause License
+- soupsieve - MIT License
 - requests - Apache License 2.0
 - urllib - Python Software Foundation License
-- json - Python Software Foundation License
+- orjson - Apache License 2.0 / MIT License
+- functools - Python Software Foundation License
+- concurrent.futures - Python Software Foundation License
+- threading - Python Software Foundation License
 """
 """
 @package data_scraping.web_scraper
@@ -28,79 +33,146 @@ fetching web pages, handling headers and cookies, and parsing HTML content.
 @license MIT
 @dependencies
 - BeautifulSoup (bs4) - MIT License
+- lxml - BSD 3-Clause License
+- soupsieve - MIT License
 - requests - Apache License 2.0
 - urllib - Python Software Foundation License
-- json - Python Software Foundation License
+- orjson - Apache License 2.0 / MIT License
+- functools - Python Software Foundation License
+- concurrent.futures - Python Software Foundation License
+- threading - Python Software Foundation License
 """
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 from urllib.robotparser import RobotFileParser
 from urllib.parse import urlparse, urljoin
-import json
+import orjson
+import soupsieve
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from .session import build_session
+
+_ROBOT_PARSER_CACHE_SIZE = 256
+_robot_parsers = {}
+_robot_parsers_lock = threading.Lock()
+
+def _robot_parser_for(scheme, netloc):
+    # robots.txt is fetched at most once per host per process, but only a parser that
+    # actually loaded is kept: after a 5xx it would deny every URL until restart.
+    key = (scheme, netloc)
+    with _robot_parsers_lock:
+        robot_parser = _robot_parsers.get(key)
+        if robot_parser is not None:
+            return robot_parser
+
+        robot_parser = RobotFileParser()
+        robot_parser.set_url(f"{scheme}://{netloc}/robots.txt")
+        robot_parser.read()
+        if robot_parser.mtime() or robot_parser.allow_all or robot_parser.disallow_all:
+            if len(_robot_parsers) >= _ROBOT_PARSER_CACHE_SIZE:
+                _robot_parsers.pop(next(iter(_robot_parsers)))
+            _robot_parsers[key] = robot_parser
+        return robot_parser
+
+@lru_cache(maxsize=128)
+def _compile_selector(css_selector):
+    # Skips the per-call setup soup.select() does before reaching soupsieve's own pattern cache.
+    return soupsieve.compile(css_selector)
 
 class WebScraper:
-    def __init__(self, base_url, headers=None, cookies=None, user_agent='WebScraperBot'):
+    def __init__(self, base_url, headers=None, cookies=None, user_agent='WebScraperBot',
+                 pool_connections=10, pool_maxsize=50, parser='lxml', cache_name='webscraper_cache', cache_ttl=None):
         self.base_url = base_url
         self.headers = headers or {}
         self.cookies = cookies or {}
         self.user_agent = user_agent
-        self.robot_parser = self._initialize_robot_parser()
+        self.parser = parser
+        self.cache_name = cache_name
+        self.cache_ttl = cache_ttl
+        self.session = build_session(pool_connections, pool_maxsize, cache_name=cache_name, cache_ttl=cache_ttl)
 
-    def _initialize_robot_parser(self):
-        parsed_url = urlparse(self.base_url)
-        robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-        robot_parser = RobotFileParser()
-        robot_parser.set_url(robots_url)
-        robot_parser.read()
-        return robot_parser
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _is_allowed_by_robots(self, url):
-        return self.robot_parser.can_fetch(self.user_agent, url)
+        parsed_url = urlparse(url)
+        robot_parser = _robot_parser_for(parsed_url.scheme, parsed_url.netloc)
+        return robot_parser.can_fetch(self.user_agent, url)
 
     def fetch_page(self, url, params=None, method='GET'):
+        response = self._request(url, params=params, method=method)
+        return response.text
+
+    def fetch_soup(self, url, params=None, method='GET'):
+        # Streams the body straight into the parser instead of materializing response.text first.
+        with self._request(url, params=params, method=method, stream=True) as response:
+            response.raw.decode_content = True
+            content_type = response.headers.get('content-type', '')
+            encoding = response.encoding if 'charset' in content_type.lower() else None
+            return self.parse_html(response.raw, from_encoding=encoding)
+
+    def _request(self, url, params=None, method='GET', stream=False):
         full_url = urljoin(self.base_url, url)
         if not self._is_allowed_by_robots(full_url):
             raise PermissionError(f"Fetching the URL '{full_url}' is disallowed by the site's robots.txt file.")
         
         if method == 'GET':
-            response = requests.get(full_url, headers=self.headers, cookies=self.cookies, params=params)
+            response = self.session.get(full_url, headers=self.headers, cookies=self.cookies, params=params,
+                                        stream=stream)
         elif method == 'POST':
-            response = requests.post(full_url, headers=self.headers, cookies=self.cookies, data=params)
+            response = self.session.post(full_url, headers=self.headers, cookies=self.cookies, data=params,
+                                         stream=stream)
         else:
             raise ValueError(f"Unsupported HTTP method: {method}")
         
-        response.raise_for_status()
-        return response.text
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        return response
 
-    def parse_html(self, html):
-        soup = BeautifulSoup(html, 'html.parser')
+    def fetch_pages(self, urls, params=None, method='GET', max_workers=10):
+        # Keeps several requests in flight over the pooled session; results follow the order of urls.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda url: self.fetch_page(url, params=params, method=method), urls))
+
+    def parse_html(self, html, from_encoding=None):
+        soup = BeautifulSoup(html, self.parser, from_encoding=from_encoding)
         return soup
 
     def scrape_data(self, url, parser_func, params=None, method='GET'):
-        html = self.fetch_page(url, params=params, method=method)
-        soup = self.parse_html(html)
+        soup = self.fetch_soup(url, params=params, method=method)
         return parser_func(soup)
 
     def extract_links(self, soup, css_selector='a'):
-        links = [a.get('href') for a in soup.select(css_selector) if a.get('href')]
+        links = [a.get('href') for a in _compile_selector(css_selector).select(soup) if a.get('href')]
         return links
 
     def extract_text(self, soup, css_selector):
-        texts = [element.get_text(strip=True) for element in soup.select(css_selector)]
+        texts = [element.get_text(strip=True) for element in _compile_selector(css_selector).select(soup)]
         return texts
 
     def extract_metadata(self, soup):
         metadata = {}
         for meta in soup.find_all('meta'):
-            if meta.get('name'):
-                metadata[meta['name']] = meta.get('content', '')
-            elif meta.get('property'):
-                metadata[meta['property']] = meta.get('content', '')
+            attrs = meta.attrs
+            name = attrs.get('name') or attrs.get('property')
+            if name:
+                metadata[name] = attrs.get('content', '')
         return metadata
 
     def extract_table(self, soup, css_selector='table'):
-        table = soup.select_one(css_selector)
+        table = _compile_selector(css_selector).select_one(soup)
         if not table:
             return []
         
@@ -114,13 +186,13 @@ class WebScraper:
 
     def handle_pagination(self, url, parser_func, params=None, method='GET', next_page_selector='a.next'):
         all_data = []
+        next_page_matcher = _compile_selector(next_page_selector)
         while url:
-            html = self.fetch_page(url, params=params, method=method)
-            soup = self.parse_html(html)
+            soup = self.fetch_soup(url, params=params, method=method)
             data = parser_func(soup)
             all_data.extend(data)
             
-            next_page = soup.select_one(next_page_selector)
+            next_page = next_page_matcher.select_one(soup)
             if next_page and next_page.get('href'):
                 url = urljoin(self.base_url, next_page['href'])
             else:
@@ -140,36 +212,103 @@ class WebScraper:
 
     def extract_lists(self, soup, css_selector='ul, ol'):
         lists = []
-        for list_element in soup.select(css_selector):
+        for list_element in _compile_selector(css_selector).select(soup):
             items = [li.get_text(strip=True) for li in list_element.find_all('li')]
             lists.append(items)
         return lists
 
     def extract_images(self, soup, css_selector='img'):
-        images = [img.get('src') for img in soup.select(css_selector) if img.get('src')]
+        images = [img.get('src') for img in _compile_selector(css_selector).select(soup) if img.get('src')]
         return images
 
     def extract_json_ld(self, soup):
+        return self._parse_json_ld(soup.find_all('script', type='application/ld+json'))
+
+    def _parse_json_ld(self, scripts):
         json_ld_data = []
-        for script in soup.find_all('script', type='application/ld+json'):
+        for script in scripts:
+            text = script.string
+            if not text or text.isspace():
+                continue
             try:
-                json_data = json.loads(script.string)
+                json_data = orjson.loads(text.encode())
                 json_ld_data.append(json_data)
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 continue
         return json_ld_data
 
     def extract_forms(self, soup, css_selector='form'):
         forms = []
-        for form in soup.select(css_selector):
-            form_data = {
-                'action': form.get('action'),
-                'method': form.get('method', 'get').lower(),
-                'fields': {}
-            }
+        for form in _compile_selector(css_selector).select(soup):
+            attrs = form.attrs
+            fields = {}
             for input_tag in form.find_all(['input', 'textarea', 'select']):
-                name = input_tag.get('name')
+                input_attrs = input_tag.attrs
+                name = input_attrs.get('name')
                 if name:
-                    form_data['fields'][name] = input_tag.get('value', '')
-            forms.append(form_data)
+                    fields[name] = input_attrs.get('value', '')
+            forms.append({
+                'action': attrs.get('action'),
+                'method': attrs.get('method', 'get').lower(),
+                'fields': fields
+            })
         return forms
+
+    def extract_all(self, soup):
+        links = []
+        images = []
+        paragraphs = []
+        headings = {f'h{level}': [] for level in range(1, 7)}
+        metadata = {}
+        json_ld_scripts = []
+        forms = []
+        forms_by_element = {}
+
+        # One walk over the tree fills every bucket instead of one find_all() per extractor.
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            name = element.name
+            attrs = element.attrs
+            if name == 'a':
+                href = attrs.get('href')
+                if href:
+                    links.append(href)
+            elif name == 'img':
+                src = attrs.get('src')
+                if src:
+                    images.append(src)
+            elif name == 'p':
+                paragraphs.append(element.get_text(strip=True))
+            elif name in headings:
+                headings[name].append(element.get_text(strip=True))
+            elif name == 'meta':
+                meta_name = attrs.get('name') or attrs.get('property')
+                if meta_name:
+                    metadata[meta_name] = attrs.get('content', '')
+            elif name == 'script':
+                if attrs.get('type') == 'application/ld+json':
+                    json_ld_scripts.append(element)
+            elif name == 'form':
+                form_data = {
+                    'action': attrs.get('action'),
+                    'method': attrs.get('method', 'get').lower(),
+                    'fields': {}
+                }
+                forms.append(form_data)
+                forms_by_element[id(element)] = form_data
+            elif name in ('input', 'textarea', 'select'):
+                field_name = attrs.get('name')
+                if field_name:
+                    for form in element.find_parents('form'):
+                        forms_by_element[id(form)]['fields'][field_name] = attrs.get('value', '')
+
+        return {
+            'links': links,
+            'images': images,
+            'paragraphs': paragraphs,
+            'headings': headings,
+            'metadata': metadata,
+            'json_ld': self._parse_json_ld(json_ld_scripts),
+            'forms': forms
+        }
@@ -0,0 +1,184 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from data_scraping import APIFetcher
+
+
+class _UnavailableHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def _reply(self):
+        self.requests_seen.append(self.command)
+        self.send_response(503)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def unavailable_server():
+    _UnavailableHandler.requests_seen = []
+    server = HTTPServer(('127.0.0.1', 0), _UnavailableHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", _UnavailableHandler.requests_seen
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_data_does_not_replay_post(unavailable_server):
+    base_url, seen = unavailable_server
+    with APIFetcher(base_url, retries=3, backoff_factor=0) as fetcher:
+        with pytest.raises(requests.HTTPError):
+            fetcher.fetch_data('items', method='POST')
+    assert seen == ['POST']
+
+
+def test_fetch_data_retries_get(unavailable_server):
+    base_url, seen = unavailable_server
+    with APIFetcher(base_url, retries=2, backoff_factor=0) as fetcher:
+        with pytest.raises(requests.HTTPError):
+            fetcher.fetch_data('items')
+    assert seen == ['GET'] * 3
+
+
+def test_fetch_data_with_retry_uses_instance_retries_by_default(unavailable_server):
+    base_url, seen = unavailable_server
+    with APIFetcher(base_url, retries=4, backoff_factor=0) as fetcher:
+        with pytest.raises(requests.HTTPError):
+            fetcher.fetch_data_with_retry('items')
+    assert seen == ['GET'] * 5
+
+
+def test_fetch_data_with_retry_honours_explicit_retries_and_post(unavailable_server):
+    base_url, seen = unavailable_server
+    with APIFetcher(base_url, retries=4, backoff_factor=0) as fetcher:
+        with pytest.raises(requests.HTTPError):
+            fetcher.fetch_data_with_retry('items', method='POST', retries=1)
+        assert fetcher._retry_session(1) is fetcher._retry_session(1)
+    assert seen == ['POST'] * 2
+
+
+class _HTMLHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b'<html>maintenance</html>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_fetch_data_raises_request_exception_on_invalid_json():
+    server = HTTPServer(('127.0.0.1', 0), _HTMLHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with APIFetcher(f"http://127.0.0.1:{server.server_port}") as fetcher:
+            with pytest.raises(requests.exceptions.JSONDecodeError) as excinfo:
+                fetcher.fetch_data('items')
+        assert isinstance(excinfo.value, requests.RequestException)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class _EchoHeadersHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps(dict(self.headers)).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_headers_changed_after_construction_are_sent():
+    server = HTTPServer(('127.0.0.1', 0), _EchoHeadersHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with APIFetcher(f"http://127.0.0.1:{server.server_port}", headers={'X-Client': 'test'}) as fetcher:
+            fetcher.headers['Authorization'] = 'Bearer token'
+            echoed = fetcher.fetch_data('items')
+        assert echoed['X-Client'] == 'test'
+        assert echoed['Authorization'] == 'Bearer token'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class _PagesHandler(BaseHTTPRequestHandler):
+    last_page = 5
+    advertise_last = True
+    pages_seen = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        page = int(query['page'][0])
+        self.pages_seen.append(page)
+        # Earlier pages answer last, so completion order differs from page order.
+        time.sleep((self.last_page - page) * 0.02)
+        links = []
+        if page < self.last_page:
+            links.append(f'<http://{self.headers["Host"]}/items?page={page + 1}>; rel="next"')
+        if self.advertise_last:
+            links.append(f'<http://{self.headers["Host"]}/items?page={self.last_page}&q=x>; rel="last"')
+        body = json.dumps([{'page': page, 'q': query['q'][0]}]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if links:
+            self.send_header('Link', ', '.join(links))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def pages_server():
+    _PagesHandler.pages_seen = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _PagesHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_paginated_data_concurrent_uses_last_link(pages_server, monkeypatch):
+    monkeypatch.setattr(_PagesHandler, 'advertise_last', True)
+    with APIFetcher(pages_server) as fetcher:
+        data = fetcher.fetch_paginated_data_concurrent('items', params={'q': 'x'}, start_page=2, max_workers=4)
+    assert data == [{'page': page, 'q': 'x'} for page in range(2, 6)]
+    assert _PagesHandler.pages_seen[0] == 2
+    assert sorted(_PagesHandler.pages_seen) == [2, 3, 4, 5]
+
+
+def test_fetch_paginated_data_concurrent_falls_back_to_next_links(pages_server, monkeypatch):
+    monkeypatch.setattr(_PagesHandler, 'advertise_last', False)
+    params = {'q': 'x'}
+    with APIFetcher(pages_server) as fetcher:
+        data = fetcher.fetch_paginated_data_concurrent('items', params=params, start_page=2, max_workers=4)
+        assert data == fetcher.fetch_paginated_data('items', params={'q': 'x'}, start_page=2)
+    assert data == [{'page': page, 'q': 'x'} for page in range(2, 6)]
+    assert _PagesHandler.pages_seen == [2, 3, 4, 5] * 2
+    assert params == {'q': 'x'}
@@ -0,0 +1,123 @@
+import gc
+import pickle
+import weakref
+
+import numpy as np
+import pandas as pd
+import pytest
+from nltk.stem import PorterStemmer, SnowballStemmer
+
+from data_scraping import DataCleaner, data_cleaner
+
+
+@pytest.fixture
+def cleaner(monkeypatch):
+    # Keeps the tests independent of the NLTK stopwords corpus being downloaded.
+    monkeypatch.setattr(data_cleaner, '_english_stop_words', lambda: frozenset({'the', 'a', 'is'}))
+    return DataCleaner()
+
+
+def test_stem_text_uses_the_instance_stemmer(cleaner):
+    assert cleaner.stem_text('generously') == 'gener'
+    cleaner.stemmer = SnowballStemmer('english')
+    assert cleaner.stem_text('generously') == 'generous'
+
+
+@pytest.mark.parametrize('text, tokens', [
+    ('It costs 3.50, not 1,000.', ['It', 'costs', '3.50', ',', 'not', '1,000', '.']),
+    ('The U.S. economy', ['The', 'U.S.', 'economy']),
+    ('See https://example.com/a?b=1.', ['See', 'https://example.com/a?b=1', '.']),
+    ('Mail jo.doe@example.org now', ['Mail', 'jo.doe@example.org', 'now']),
+    ('A well-known fact!', ['A', 'well-known', 'fact', '!']),
+])
+def test_tokenizer_keeps_compound_tokens_whole(text, tokens):
+    assert DataCleaner._TOKEN_RE.findall(text) == tokens
+
+
+@pytest.mark.parametrize('flags', [
+    {'remove_stopwords': False},
+    {},
+    {'use_stemming': True},
+])
+def test_clean_column_always_returns_string_dtype(cleaner, flags):
+    df = pd.DataFrame({'text': ['<b>The</b> Cats!', None]})
+    cleaned = cleaner.clean_column(df, 'text', **flags)['text']
+    assert cleaned.dtype == 'string'
+    assert cleaned.isna().tolist() == [False, True]
+
+
+@pytest.mark.parametrize('n_jobs', [None, 0, -2, 1.5, True])
+def test_invalid_n_jobs_is_rejected(n_jobs):
+    with pytest.raises(ValueError):
+        DataCleaner(n_jobs=n_jobs)
+
+
+def test_n_jobs_accepts_numpy_integers(monkeypatch):
+    monkeypatch.setattr(data_cleaner, '_english_stop_words', lambda: frozenset())
+    assert DataCleaner(n_jobs=np.int64(2)).n_jobs == 2
+
+
+def test_n_jobs_all_cores_falls_back_when_cpu_count_is_unknown(monkeypatch):
+    monkeypatch.setattr(data_cleaner, '_english_stop_words', lambda: frozenset())
+    monkeypatch.setattr(data_cleaner.os, 'cpu_count', lambda: None)
+    assert DataCleaner(n_jobs=-1).n_jobs == 1
+
+
+def test_stock_stemmer_copies_share_one_memo_table():
+    stemmer = PorterStemmer()
+    stem = data_cleaner._memoized_method(stemmer, 'stem')
+    assert data_cleaner._memoized_method(PorterStemmer(), 'stem') is stem
+    assert data_cleaner._memoized_method(pickle.loads(pickle.dumps(stemmer)), 'stem') is stem
+    assert data_cleaner._memoized_method(PorterStemmer(mode=PorterStemmer.MARTIN_EXTENSIONS), 'stem') is not stem
+
+
+class _ReverseStemmer:
+    def stem(self, word):
+        return word[::-1]
+
+
+def test_custom_stemmer_is_used_and_not_retained(cleaner):
+    stemmer = _ReverseStemmer()
+    cleaner.stemmer = stemmer
+    assert cleaner.stem_text('abc') == 'cba'
+    reference = weakref.ref(stemmer)
+    del stemmer
+    cleaner.stemmer = PorterStemmer()
+    gc.collect()
+    assert reference() is None
+
+
+def test_parallel_clean_column_matches_serial(monkeypatch):
+    monkeypatch.setattr(data_cleaner, '_english_stop_words', lambda: frozenset({'the', 'a', 'is'}))
+    texts = ['The <b>cats</b> are running', 'A dog is barking!', None, 'The cats are running'] * 5
+    serial = DataCleaner().clean_column(pd.DataFrame({'text': texts}), 'text', use_stemming=True)
+    parallel = DataCleaner(n_jobs=2).clean_column(pd.DataFrame({'text': texts}), 'text', use_stemming=True)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def _old_normalize(df):
+    return (df - df.min()) / (df.max() - df.min())
+
+
+NUMERIC_FRAME = pd.DataFrame({
+    'float32': np.array([1, 2, 4], dtype=np.float32),
+    'float32_constant': np.array([2, 2, 2], dtype=np.float32),
+    'int': [1, 5, 9],
+    'constant': [2.0, 2.0, 2.0],
+    'all_nan': [np.nan, np.nan, np.nan],
+    'float_with_nan': [0.5, np.nan, 1.5],
+    'nullable_int': pd.array([1, None, 3], dtype='Int64'),
+}, index=['a', 'b', 'c'])
+
+
+@pytest.mark.parametrize('column', NUMERIC_FRAME.columns)
+def test_normalize_dataframe_matches_pandas_arithmetic_per_column(cleaner, column):
+    frame = NUMERIC_FRAME[[column]]
+    pd.testing.assert_frame_equal(cleaner.normalize_dataframe(frame), _old_normalize(frame))
+
+
+def test_normalize_dataframe_keeps_per_column_dtypes_in_mixed_frames(cleaner):
+    normalized = cleaner.normalize_dataframe(NUMERIC_FRAME)
+    for column in NUMERIC_FRAME.columns:
+        pd.testing.assert_series_equal(normalized[column], _old_normalize(NUMERIC_FRAME[[column]])[column])
+    assert NUMERIC_FRAME['float32'].tolist() == [1, 2, 4]
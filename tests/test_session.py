@@ -0,0 +1,63 @@
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from data_scraping import APIFetcher, WebScraper, web_scraper
+
+pytest.importorskip('requests_cache')
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):
+        if self.path == '/robots.txt':
+            body, content_type, encoding = b'User-agent: *\nAllow: /\n', 'text/plain', None
+        elif self.path.startswith('/page'):
+            self.hits.append(self.path)
+            body = gzip.compress(b'<html><body><p>cached page</p></body></html>')
+            content_type, encoding = 'text/html; charset=utf-8', 'gzip'
+        else:
+            self.hits.append(self.path)
+            body, content_type, encoding = b'[1, 2, 3]', 'application/json', None
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(web_scraper, '_robot_parsers', {})
+    _CountingHandler.hits = []
+    server = HTTPServer(('127.0.0.1', 0), _CountingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", _CountingHandler.hits
+    server.shutdown()
+    server.server_close()
+
+
+def test_api_fetcher_serves_repeated_get_from_cache(server, tmp_path):
+    base_url, hits = server
+    with APIFetcher(base_url, cache_name=str(tmp_path / 'api'), cache_ttl=60) as fetcher:
+        assert fetcher.fetch_data('items') == [1, 2, 3]
+        assert fetcher.fetch_data('items') == [1, 2, 3]
+    assert hits == ['/items']
+
+
+def test_web_scraper_streams_cached_gzip_response(server, tmp_path):
+    base_url, hits = server
+    with WebScraper(base_url, cache_name=str(tmp_path / 'web'), cache_ttl=60) as scraper:
+        for _ in range(2):
+            soup = scraper.fetch_soup('/page')
+            assert scraper.extract_paragraphs(soup) == ['cached page']
+    assert hits == ['/page']
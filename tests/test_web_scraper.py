@@ -0,0 +1,115 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from bs4 import BeautifulSoup
+
+from data_scraping import WebScraper, web_scraper
+
+JSON_LD_HTML = '''
+<html><head>
+<script type="application/ld+json">{"@type": "Thing", "name": "Widget"}</script>
+<script type="application/ld+json">   </script>
+<script type="application/ld+json">{not json}</script>
+</head><body></body></html>
+'''
+
+
+def test_extract_json_ld_parses_non_empty_blocks():
+    scraper = WebScraper('https://example.com')
+    for parser in ('lxml', 'html.parser'):
+        soup = BeautifulSoup(JSON_LD_HTML, parser)
+        expected = [{'@type': 'Thing', 'name': 'Widget'}]
+        assert scraper.extract_json_ld(soup) == expected
+        assert scraper.extract_all(soup)['json_ld'] == expected
+
+
+EXTRACT_ALL_HTML = '''
+<html><head>
+<meta name="description" content="A page">
+<meta property="og:title" content="Title">
+<meta charset="utf-8">
+<script type="application/ld+json">{"@type": "Thing"}</script>
+</head><body>
+<h1>Top</h1><h3>Sub <em>section</em></h3>
+<p>First <a href="/one">one</a></p>
+<a>no href</a><img src="/a.png"><img alt="no src">
+<input name="outside" value="stray">
+<form action="/search" method="POST">
+  <input name="q" value="x"><textarea name="body"></textarea><input value="unnamed">
+  <form action="/nested"><select name="inner"></select></form>
+</form>
+<form><input name="q" value="second"></form>
+<p>Last</p>
+</body></html>
+'''
+
+
+@pytest.mark.parametrize('parser', ['lxml', 'html.parser'])
+def test_extract_all_matches_individual_extractors(parser):
+    scraper = WebScraper('https://example.com')
+    soup = BeautifulSoup(EXTRACT_ALL_HTML, parser)
+    assert scraper.extract_all(soup) == {
+        'links': scraper.extract_links(soup),
+        'images': scraper.extract_images(soup),
+        'paragraphs': scraper.extract_paragraphs(soup),
+        'headings': scraper.extract_headings(soup),
+        'metadata': scraper.extract_metadata(soup),
+        'json_ld': scraper.extract_json_ld(soup),
+        'forms': scraper.extract_forms(soup),
+    }
+    assert all('outside' not in form['fields'] for form in scraper.extract_all(soup)['forms'])
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    robots_statuses = []
+    robots_fetches = 0
+
+    def do_GET(self):
+        if self.path == '/robots.txt':
+            type(self).robots_fetches += 1
+            status = self.robots_statuses.pop(0) if self.robots_statuses else 200
+            body = b'User-agent: *\nAllow: /\n' if status == 200 else b''
+        else:
+            status, body = 200, b'<html><body><p>hello</p></body></html>'
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site(monkeypatch):
+    monkeypatch.setattr(web_scraper, '_robot_parsers', {})
+    _SiteHandler.robots_statuses = []
+    _SiteHandler.robots_fetches = 0
+    server = HTTPServer(('127.0.0.1', 0), _SiteHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/", _SiteHandler
+    server.shutdown()
+    server.server_close()
+
+
+def test_robots_txt_is_fetched_once_per_host(site):
+    base_url, handler = site
+    for _ in range(2):
+        with WebScraper(base_url) as scraper:
+            assert 'hello' in scraper.fetch_page('page')
+            assert 'hello' in scraper.fetch_page('other')
+    assert handler.robots_fetches == 1
+
+
+def test_robots_txt_server_error_is_not_cached(site):
+    base_url, handler = site
+    handler.robots_statuses = [503]
+    with WebScraper(base_url) as scraper:
+        with pytest.raises(PermissionError):
+            scraper.fetch_page('page')
+        assert 'hello' in scraper.fetch_page('page')
+        assert 'hello' in scraper.fetch_page('page')
+    assert handler.robots_fetches == 2